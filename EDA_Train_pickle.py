@@ -659,6 +659,7 @@ print('Testing F1 Score :', np.round(metrics.f1_score(y_test, y_pred), 3))
 
 
 
-import pickle
-with open('loan_approval_model.pkl', 'wb') as f:
-    pickle.dump((model, scaler, encoders), f)
+# joblib stores the numpy arrays in a layout the app can memory-map;
+# protocol 5 handles the array buffers out-of-band for a faster load
+import joblib
+joblib.dump((model, scaler, encoders), 'loan_approval_model.joblib', protocol=5)
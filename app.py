@@ -1,8 +1,32 @@
 # streamlit_app.py
+# Offload sklearn estimator calls to cuML on GPU when the optional
+# RAPIDS stack is installed; must run before anything imports sklearn.
+# Falls back to plain CPU sklearn everywhere else.
+try:
+    import cuml.accel
+    cuml.accel.install()
+except ImportError:
+    pass
+
+import pathlib
+import queue
+import threading
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
+import sklearn
+
+from model_io import (load_model, load_onnx_session, load_lookups,
+                      load_scaler_params, load_tree_arrays)
+
+# Skip the NaN/inf validation sweep sklearn runs on every transform and
+# predict call -- the 1-row widget inputs are trusted and always finite
+sklearn.set_config(assume_finite=True)
+
+# Preallocated once and refilled in place on every prediction, so the
+# per-rerun hot path allocates nothing (flat column layout, float32)
+_FEATURE_BUF = np.empty((1, 11), dtype=np.float32)
+_SCALED_BUF = np.empty_like(_FEATURE_BUF)
 
 # ---- PAGE CONFIG ----
 st.set_page_config(
@@ -13,52 +37,80 @@ st.set_page_config(
 )
 
 # ---- CUSTOM STYLING ----
-st.markdown("""
-    <style>
-    /* Background gradient */
-    .stApp {
-        background: linear-gradient(135deg, #0f2027, #203a43, #2c5364);
-        color: white;
-    }
-    /* Card-like containers */
-    .card {
-        background: rgba(255, 255, 255, 0.1);
-        padding: 1.5rem;
-        border-radius: 15px;
-        box-shadow: 0px 4px 10px rgba(0,0,0,0.3);
-        margin-bottom: 1rem;
-    }
-    /* Buttons */
-    div.stButton > button:first-child {
-        background-color: #00c853;
-        color: white;
-        font-size: 1rem;
-        border-radius: 10px;
-        padding: 0.5rem 1rem;
-        border: none;
-        transition: 0.3s;
-    }
-    div.stButton > button:first-child:hover {
-        background-color: #00e676;
-        color: black;
-        transform: scale(1.05);
-    }
-    /* Titles */
-    h1, h2, h3 {
-        color: #00e5ff;
-        text-shadow: 0px 0px 10px #00e5ff;
-    }
-    /* Center text */
-    .center-text {
-        text-align: center;
-    }
-    </style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def _css():
+    # Read once per process; the cached (interned) string lets
+    # Streamlit's element reuse skip resending the payload on reruns
+    return pathlib.Path("style.css").read_text()
+
+st.markdown(f"<style>{_css()}</style>", unsafe_allow_html=True)
+
+# ---- INFERENCE HELPERS ----
+def walk_tree(x):
+    # Walk one sample to its leaf; the tuned tree is only a few levels
+    # deep, so a plain loop over the flat arrays beats sklearn's
+    # predict() wrapper without any compiled dependency
+    feature, threshold, left, right = load_tree_arrays()[:4]
+    i = 0
+    while left[i] >= 0:
+        i = left[i] if x[feature[i]] <= threshold[i] else right[i]
+    return i
+
+@st.cache_resource
+def start_prediction_worker():
+    # One daemon thread per process drains prediction requests from all
+    # sessions and runs them as a single batched predict call, so BLAS
+    # sees batches instead of 11-dim single rows under concurrent load
+    _sess = load_onnx_session()
+    _leaf_probs, _leaf_class = load_tree_arrays()[4:]
+    q = queue.Queue()
+
+    def worker():
+        while True:
+            items = [q.get()]
+            try:
+                while len(items) < 64:
+                    items.append(q.get(timeout=0.005))
+            except queue.Empty:
+                pass
+            rows = np.vstack([row for row, _, _ in items])
+            try:
+                if _sess is not None:
+                    labels, probs = _sess.run(None, {"X": rows.astype(np.float32)})
+                    probs = probs[:, 1]
+                else:
+                    # One traversal per row gives both class and probability
+                    leaves = [walk_tree(row) for row in rows]
+                    labels = [int(_leaf_class[leaf]) for leaf in leaves]
+                    probs = [float(_leaf_probs[leaf, 1]) for leaf in leaves]
+            except Exception:
+                # Mark the whole batch as failed (slots stay None) but
+                # keep the worker alive for later submissions
+                for _, event, _ in items:
+                    event.set()
+                continue
+            for (_, event, slot), label, p in zip(items, labels, probs):
+                slot[0] = int(label)
+                slot[1] = None if p is None else float(p)
+                event.set()
+
+    threading.Thread(target=worker, daemon=True).start()
+    return q
+
+def predict_one(row):
+    # Submit one scaled row to the shared worker and wait for the result.
+    # Returns (None, None) when the worker times out or fails, so the
+    # caller can show an error instead of a made-up rejection.
+    q = start_prediction_worker()
+    event = threading.Event()
+    slot = [None, None]
+    q.put((row, event, slot))
+    if not event.wait(1.0):
+        return None, None
+    return slot[0], slot[1]
 
-# ---- LOAD MODEL ----
 try:
-    with open("loan_approval_model.pkl", "rb") as f:
-        model, scaler, encoders = pickle.load(f)
+    model, scaler, encoders = load_model()
 except Exception as e:
     st.error("⚠️ Error loading model: " + str(e))
     st.stop()
@@ -72,70 +124,119 @@ st.sidebar.image("https://cdn-icons-png.flaticon.com/512/833/833314.png", width=
 st.sidebar.markdown("## Enter Applicant Details")
 
 # ---- USER INPUTS ----
-gender = st.sidebar.selectbox("Gender", ["Male", "Female"])
-married = st.sidebar.selectbox("Married", ["Yes", "No"])
-dependents = st.sidebar.selectbox("Dependents", ["0", "1", "2", "3+"])
-education = st.sidebar.selectbox("Education", ["Graduate", "Not Graduate"])
-self_employed = st.sidebar.selectbox("Self Employed", ["Yes", "No"])
-applicant_income = st.sidebar.number_input("Applicant Income", min_value=0, step=100)
-coapplicant_income = st.sidebar.number_input("Coapplicant Income", min_value=0, step=100)
-loan_amount = st.sidebar.number_input("Loan Amount", min_value=0, step=10)
-loan_amount_term = st.sidebar.selectbox("Loan Term (months)", [12, 36, 60, 120, 180, 240, 300, 360, 480])
-credit_history = st.sidebar.selectbox("Credit History", [0, 1])
-property_area = st.sidebar.selectbox("Property Area", ["Urban", "Semiurban", "Rural"])
-
-# ---- INPUT DATAFRAME ----
-input_dict = {
-    "Gender": [gender],
-    "Married": [married],
-    "Dependents": [dependents],
-    "Education": [education],
-    "Self_Employed": [self_employed],
-    "ApplicantIncome": [applicant_income],
-    "CoapplicantIncome": [coapplicant_income],
-    "LoanAmount": [loan_amount],
-    "Loan_Amount_Term": [loan_amount_term],
-    "Credit_History": [credit_history],
-    "Property_Area": [property_area],
-}
-
-df_input = pd.DataFrame(input_dict)
+# Batched in a form so changing a widget doesn't rerun preprocessing and
+# rendering -- the script only reruns when the user hits Predict
+with st.sidebar.form("loan_form"):
+    gender = st.selectbox("Gender", ["Male", "Female"])
+    married = st.selectbox("Married", ["Yes", "No"])
+    dependents = st.selectbox("Dependents", ["0", "1", "2", "3+"])
+    education = st.selectbox("Education", ["Graduate", "Not Graduate"])
+    self_employed = st.selectbox("Self Employed", ["Yes", "No"])
+    applicant_income = st.number_input("Applicant Income", min_value=0, step=100)
+    coapplicant_income = st.number_input("Coapplicant Income", min_value=0, step=100)
+    loan_amount = st.number_input("Loan Amount", min_value=0, step=10)
+    loan_amount_term = st.selectbox("Loan Term (months)", [12, 36, 60, 120, 180, 240, 300, 360, 480])
+    credit_history = st.selectbox("Credit History", [0, 1])
+    property_area = st.selectbox("Property Area", ["Urban", "Semiurban", "Rural"])
+    submitted = st.form_submit_button("🔮 Predict Loan Approval")
 
 # ---- PREPROCESS INPUT ----
-for col in df_input.columns:
-    if col in encoders:
-        df_input[col] = encoders[col].transform(df_input[col].astype(str))
+@st.cache_data
+def build_features(gender, married, dependents, education, self_employed,
+                   applicant_income, coapplicant_income, loan_amount,
+                   loan_amount_term, credit_history, property_area):
+    # Cached on the 11 input scalars, so reruns that don't change the
+    # inputs skip the encoding and scaling entirely
+    luts = load_lookups()
+    arr = _FEATURE_BUF
+    arr[0, 0] = luts["Gender"][gender]
+    arr[0, 1] = luts["Married"][married]
+    arr[0, 2] = luts["Dependents"][dependents]
+    arr[0, 3] = luts["Education"][education]
+    arr[0, 4] = luts["Self_Employed"][self_employed]
+    arr[0, 5] = applicant_income
+    arr[0, 6] = coapplicant_income
+    arr[0, 7] = loan_amount
+    arr[0, 8] = loan_amount_term
+    arr[0, 9] = credit_history
+    arr[0, 10] = luts["Property_Area"][property_area]
+    # Inline (x - mean) / scale, fused and in place -- no new arrays and
+    # none of scaler.transform's conversion overhead
+    mean, scale = load_scaler_params()
+    np.subtract(arr, mean, out=_SCALED_BUF)
+    np.divide(_SCALED_BUF, scale, out=_SCALED_BUF)
+    return _SCALED_BUF
+
+if submitted:
+    st.session_state["summary"] = pd.DataFrame({
+        "Gender": [gender],
+        "Married": [married],
+        "Dependents": [dependents],
+        "Education": [education],
+        "Self_Employed": [self_employed],
+        "ApplicantIncome": [applicant_income],
+        "CoapplicantIncome": [coapplicant_income],
+        "LoanAmount": [loan_amount],
+        "Loan_Amount_Term": [loan_amount_term],
+        "Credit_History": [credit_history],
+        "Property_Area": [property_area],
+    })
 
-df_input_scaled = scaler.transform(df_input)
+# ---- RESULT CARD ----
+@st.cache_data(show_spinner=False)
+def result_html(prob_pct, approved):
+    # The whole card is one memoized HTML string (keyed on the rounded
+    # probability), rendered as a static bar instead of the animated
+    # st.progress component, so reruns resend nothing new
+    if approved:
+        body = ("<h2 class='center-text'>✅ Loan Approved!</h2>"
+                "<p class='center-text'>Congratulations! Based on your details, "
+                "your loan application is likely to be approved. 🎉</p>")
+    else:
+        body = ("<h2 class='center-text'>❌ Loan Rejected</h2>"
+                "<p class='center-text'>Unfortunately, your loan application might "
+                "not be approved. Consider improving your credit history or income.</p>")
+    if prob_pct is not None:
+        body += (
+            "<div style='background:rgba(255,255,255,0.2);border-radius:8px;height:12px;'>"
+            f"<div style='width:{prob_pct}%;background:#00e676;height:12px;border-radius:8px;'></div>"
+            "</div>"
+            f"<p class='center-text'>Approval Probability: <b>{prob_pct}%</b></p>"
+        )
+    return "<div class='card'>" + body + "</div>"
 
 # ---- MAIN CONTENT ----
-st.markdown("### 📋 Applicant Summary")
-st.dataframe(df_input, use_container_width=True)
+if "summary" in st.session_state:
+    st.markdown("### 📋 Applicant Summary")
+    st.dataframe(st.session_state["summary"], use_container_width=True)
 
 # ---- PREDICTION ----
-if st.button("🔮 Predict Loan Approval"):
-    with st.spinner("Analyzing application... ⏳"):
-        prediction = model.predict(df_input_scaled)[0]
-        prob = None
-        try:
-            prob = model.predict_proba(df_input_scaled)[0][1]
-        except:
-            prob = None
-
-    st.markdown("<br>", unsafe_allow_html=True)
-    st.markdown("<div class='card'>", unsafe_allow_html=True)
-    if prediction == 1:
-        st.markdown("<h2 class='center-text'>✅ Loan Approved!</h2>", unsafe_allow_html=True)
-        st.balloons()
-        st.markdown("<p class='center-text'>Congratulations! Based on your details, your loan application is likely to be approved. 🎉</p>", unsafe_allow_html=True)
+if submitted:
+    # Re-submitting unchanged inputs reuses the stored result instead of
+    # running preprocessing and prediction again
+    key = (gender, married, dependents, education, self_employed,
+           applicant_income, coapplicant_income, loan_amount,
+           loan_amount_term, credit_history, property_area)
+    if st.session_state.get("last_key") == key:
+        prediction, prob = st.session_state["last_result"]
     else:
-        st.markdown("<h2 class='center-text'>❌ Loan Rejected</h2>", unsafe_allow_html=True)
-        st.markdown("<p class='center-text'>Unfortunately, your loan application might not be approved. Consider improving your credit history or income.</p>", unsafe_allow_html=True)
+        with st.spinner("Analyzing application... ⏳"):
+            df_input_scaled = build_features(*key)
+            prediction, prob = predict_one(df_input_scaled)
+        # Only cache real results -- a timed-out/failed prediction must
+        # not be replayed on the next submit of the same inputs
+        if prediction is not None:
+            st.session_state["last_key"] = key
+            st.session_state["last_result"] = (prediction, prob)
 
-    if prob is not None:
-        st.progress(float(prob))
-        st.markdown(f"<p class='center-text'>Approval Probability: <b>{prob*100:.2f}%</b></p>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    if prediction is None:
+        st.error("⚠️ Prediction failed or timed out. Please try again.")
+    else:
+        st.markdown("<br>", unsafe_allow_html=True)
+        prob_pct = None if prob is None else int(prob * 100)
+        st.markdown(result_html(prob_pct, prediction == 1), unsafe_allow_html=True)
+        if prediction == 1:
+            st.balloons()
 
 # ---- FOOTER ----
 st.markdown("""
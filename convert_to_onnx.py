@@ -0,0 +1,31 @@
+# One-time conversion of the trained sklearn model to ONNX.
+# Requires the optional skl2onnx package: pip install skl2onnx
+# Run once after training; app.py picks up model.onnx automatically.
+import os
+import joblib
+
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+
+# Loading the trained model -- same .joblib-then-.pkl fallback as
+# model_io.load_model, so the converter always sees the latest artifact
+path = "loan_approval_model.joblib"
+if not os.path.exists(path):
+    path = "loan_approval_model.pkl"
+model, scaler, encoders = joblib.load(path)
+
+
+# Converting to ONNX (zipmap off so probabilities come back as a plain array)
+onx = convert_sklearn(
+    model,
+    initial_types=[("X", FloatTensorType([None, 11]))],
+    options={id(model): {"zipmap": False}},
+)
+
+
+# Saving the ONNX model
+with open("model.onnx", "wb") as f:
+    f.write(onx.SerializeToString())
+
+print("✅ model.onnx written")
@@ -0,0 +1,75 @@
+# Shared model-loading helpers for the Streamlit app.
+# Everything here is cached with st.cache_resource, so each artifact is
+# read and unpacked once per process no matter how often the app reruns.
+import os
+import joblib
+import numpy as np
+import streamlit as st
+
+
+@st.cache_resource
+def load_model():
+    # Deserialized once per process; reused across Streamlit reruns.
+    # mmap_mode='r' memory-maps the numpy arrays inside the model and
+    # scaler so multiple worker processes share the same pages. joblib
+    # also reads the legacy plain-pickle artifact, so fall back to it
+    # when the .joblib file hasn't been written yet.
+    path = "loan_approval_model.joblib"
+    if not os.path.exists(path):
+        path = "loan_approval_model.pkl"
+    return joblib.load(path, mmap_mode="r")
+
+
+@st.cache_resource
+def load_onnx_session():
+    # Runs the model in compiled C++ with minimal per-call overhead.
+    # Returns None when model.onnx (see convert_to_onnx.py) or
+    # onnxruntime is unavailable, and the sklearn model is used instead.
+    try:
+        import onnxruntime as rt
+    except ImportError:
+        return None
+    if not os.path.exists("model.onnx"):
+        return None
+    return rt.InferenceSession("model.onnx", providers=["CPUExecutionProvider"])
+
+
+@st.cache_resource
+def load_scaler_params():
+    # float32 copies of the fitted standardization parameters, so the
+    # app can compute (x - mean) / scale in place without going through
+    # scaler.transform's conversion and validation machinery
+    _, scaler, _ = load_model()
+    return scaler.mean_.astype(np.float32), scaler.scale_.astype(np.float32)
+
+
+@st.cache_resource
+def load_lookups():
+    # class -> code dicts, built once from each LabelEncoder's classes_,
+    # so the hot path is a plain dict lookup instead of encoder.transform
+    _, _, encoders = load_model()
+    return {col: {c: i for i, c in enumerate(enc.classes_)}
+            for col, enc in encoders.items()}
+
+
+@st.cache_resource
+def load_tree_arrays():
+    # Compact copies of the fitted tree for the prediction walker.
+    # Thresholds are kept as float32 rather than float16/int16: incomes
+    # run into the tens of thousands, beyond float16's integer-exact
+    # range, so narrower types could flip comparisons. float32 still
+    # halves the bytes moved per node versus sklearn's float64 storage.
+    # leaf_probs/leaf_class are precomputed per node so one traversal
+    # yields both the predicted class and its probability, with no
+    # predict_proba call.
+    model, _, _ = load_model()
+    t = model.tree_
+    value = t.value.squeeze(1).astype(np.float32)
+    leaf_probs = value / value.sum(axis=1, keepdims=True)
+    leaf_class = leaf_probs.argmax(axis=1)
+    return (t.feature.astype(np.int16),
+            t.threshold.astype(np.float32),
+            t.children_left.astype(np.int32),
+            t.children_right.astype(np.int32),
+            leaf_probs,
+            leaf_class)